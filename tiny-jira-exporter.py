@@ -1,7 +1,8 @@
 # coding: utf8
 
 import argparse
-import pandas as pd
+import csv
+import os
 from utils.issue_parser import IssueParser
 from utils.exporter_config import ExporterConfig
 
@@ -24,10 +25,18 @@ def write_csv_file(data:list, location:str=""):
     if location == None or location == "":
         location = DEFAULT_OUTPUT_FILE
 
-    # Write data to csv file using the Pandas module
+    # The columns are all keys in the order of their first appearance.
+    # Issues missing a column get an empty value.
+    columns = {}
+    for row in data:
+        columns.update(dict.fromkeys(row))
+
+    # Write data to csv file, row by row
     try:
-        df = pd.DataFrame.from_dict(data)
-        df.to_csv(location, index=False, sep=";", encoding="latin-1")
+        with open(location, "w", encoding="latin-1", newline="") as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=columns, delimiter=";", lineterminator=os.linesep)
+            writer.writeheader()
+            writer.writerows(data)
     except Exception as e:
         raise Exception("Error writing CSV file:", e)
     
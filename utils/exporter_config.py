@@ -1,6 +1,15 @@
 # coding: utf8
 
+import sys
 import yaml
+from types import MappingProxyType
+
+try:
+    from yaml import CSafeLoader as _YamlLoader # Parser implemented in C, requires libyaml
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+_MISSING = object() # Sentinel for dict.get() to tell absent keys apart from None values
 
 class ExporterConfig:
     YAML__CONNECTION = "Connection"
@@ -27,6 +36,60 @@ class ExporterConfig:
     
     DECIMAL_SEPARATOR_POINT = "Point"
     DECIMAL_SEPARATOR_COMMA = "Comma"
+    DECIMAL_SEPARATORS = frozenset((DECIMAL_SEPARATOR_POINT, DECIMAL_SEPARATOR_COMMA))
+
+    JQL_ORDER_BY = " ORDER BY issuekey ASC"
+
+    DEFAULT_FIELDS_INTERNAL_NAMES = MappingProxyType({
+        "issueID": "id",
+        "issueKey": "key",
+        "issueType": "issuetype",
+        "Summary": "summary",
+        "Reporter": "reporter",
+        "Assignee": "assignee",
+        "Status": "status",
+        "Resolution": "resolution",
+        "Priority": "priority",
+        "Created": "created",
+        "Resolved": "resolutiondate", # "resolved" is only an alias in JQL
+        "Labels": "labels",
+        "Flagged": "" # it's a custom field that must be defined inside the YAML config file
+    })
+
+    REQUIRED_FIELDS_TO_FETCH = (
+        "id", # always required and exported to CSV
+        "key", # always required and exported to CSV
+        "issuetype", # always required and exported to CSV
+        "summary" # always required for progress bar, optional output to CSV
+    )
+
+    WORKFLOW_FIELDS_TO_FETCH = (
+        "status", # required for workflow parser, optional output to CSV
+        "created" # required for workflow parser, optional output to CSV
+    )
+
+    # No per-instance __dict__, the attributes are fixed
+    __slots__ = (
+        "_domain",
+        "_username",
+        "_api_token",
+        "_jql_query",
+        "_issue_types",
+        "_max_results",
+        "_status_categories",
+        "_status_category_mapping",
+        "_has_workflow",
+        "_default_fields",
+        "_default_fields_internal_names",
+        "_custom_fields",
+        "_fields_to_fetch",
+        "_fields_to_fetch_seen",
+        "_field_id_flagged",
+        "_custom_field_prefix",
+        "_status_category_prefix",
+        "_decimal_separator",
+        "_time_zone"
+    )
 
     def __init__(self, yaml_file_location:str):
         self._domain = ""
@@ -35,36 +98,14 @@ class ExporterConfig:
         self._jql_query = ""
         self._issue_types = []
         self._max_results = 100
-        self._exclude_created_date = ""
-        self._exclude_resolved_date = ""
         self._status_categories = []
         self._status_category_mapping = {}
+        self._has_workflow = False
         self._default_fields = []
-        self._default_fields_internal_names = {
-            "issueID": "id",
-            "issueKey": "key",
-            "issueType": "issuetype",
-            "Summary": "summary",
-            "Reporter": "reporter",
-            "Assignee": "assignee",
-            "Summary": "summary",
-            "Status": "status",
-            "Resolution": "resolution",
-            "Priority": "priority",
-            "Created": "created",
-            "Resolved": "resolved",
-            "Labels": "labels",
-            "Flagged": "" # it's a custom field that must be defined inside the YAML config file
-        }
+        self._default_fields_internal_names = dict(self.DEFAULT_FIELDS_INTERNAL_NAMES)
         self._custom_fields = {}
-        self._fields_to_fetch = [
-            "id", # always required and exported to CSV
-            "key", # always required and exported to CSV
-            "issuetype", # always required and exported to CSV
-            "status", # always required for workflow parser, optional output to CSV
-            "created", # always required for workflow parser, optional output to CSV
-            "summary" # always required for progress bar, optional output to CSV
-        ]
+        self._fields_to_fetch = list(self.REQUIRED_FIELDS_TO_FETCH)
+        self._fields_to_fetch_seen = set(self.REQUIRED_FIELDS_TO_FETCH) # for O(1) duplicate checks
         self._field_id_flagged = ""
         self._custom_field_prefix = ""
         self._status_category_prefix = ""
@@ -107,15 +148,16 @@ class ExporterConfig:
         return self._max_results
     
     def has_workflow(self) -> bool:
-        return len(self._status_categories) > 0
+        return self._has_workflow
     
     def get_status_categories(self) -> list:
         return self._status_categories
         
     def get_status_category_from_status(self, status:str):
-        if status not in self._status_category_mapping:
+        status_category = self._status_category_mapping.get(status, _MISSING)
+        if status_category is _MISSING:
             raise ValueError("Unable to get status category. Status not defined.")
-        return self._status_category_mapping[status] # Add 'Category:' as prefix so its not confused with other fields
+        return status_category
      
     def get_status_category_mapping(self) -> dict:
         return self._status_category_mapping
@@ -136,9 +178,10 @@ class ExporterConfig:
         return self._fields_to_fetch
 
     def get_custom_field_id(self, custom_field_name:str) -> str:
-        if custom_field_name not in self._custom_fields:
+        custom_field_id = self._custom_fields.get(custom_field_name, _MISSING)
+        if custom_field_id is _MISSING:
             raise ValueError("Custom field does not exist")
-        return self._custom_fields[custom_field_name]
+        return custom_field_id
     
     def get_field_id_flagged(self) -> str:
         return self._field_id_flagged
@@ -170,145 +213,163 @@ class ExporterConfig:
         Raises:
             ...: ...
         """
-        # Open the YAML file in read mode
-        with open(file_location, "r") as file:
-            # Parse the contents using safe_load()
-            data = yaml.safe_load(file)
+        # Read the whole YAML file at once and let the parser decode the raw bytes
+        with open(file_location, "rb") as file:
+            raw_data = file.read()
+        # Parse the contents with the safe loader (the C version if available)
+        data = yaml.load(raw_data, Loader=_YamlLoader)
         
         # Check if mandatory fields are configured
-        if self.YAML__MANDATORY not in data:
+        mandatory = data.get(self.YAML__MANDATORY, _MISSING)
+        if mandatory is _MISSING:
             raise ValueError("Mandatory fields missing in YAML file.")
+        mandatory = mandatory or {}
 
         # Set up the Jira access data, this part of the configuration is optional.
-        if self.YAML__CONNECTION in data:
-            if self.YAML__CONNECTION__DOMAIN in data[self.YAML__CONNECTION]:
-                self._domain = data[self.YAML__CONNECTION][self.YAML__CONNECTION__DOMAIN]
-
-            if self.YAML__CONNECTION__USERNAME in data[self.YAML__CONNECTION]:
-                self._username = data[self.YAML__CONNECTION][self.YAML__CONNECTION__USERNAME]
-            
-            if self.YAML__CONNECTION__API_TOKEN in data[self.YAML__CONNECTION]:
-                self._api_token = data[self.YAML__CONNECTION][self.YAML__CONNECTION__API_TOKEN]
+        connection = data.get(self.YAML__CONNECTION) or {}
+        domain = connection.get(self.YAML__CONNECTION__DOMAIN, _MISSING)
+        if domain is not _MISSING:
+            self._domain = domain
+
+        username = connection.get(self.YAML__CONNECTION__USERNAME, _MISSING)
+        if username is not _MISSING:
+            self._username = username
+        
+        api_token = connection.get(self.YAML__CONNECTION__API_TOKEN, _MISSING)
+        if api_token is not _MISSING:
+            self._api_token = api_token
 
-        if self.YAML__SEARCH_CRITERIA not in data:
+        search_criteria = data.get(self.YAML__SEARCH_CRITERIA, _MISSING)
+        if search_criteria is _MISSING:
             raise ValueError("No search criteria defined in YAML config file.")
         
-        # Prepare the string for the date restrictions
-        jql_restrict_dates = ""
+        # Prepare the conditions for the date restrictions
+        jql_date_conditions = []
         # Issues created after a certain date
-        if self.YAML__SEARCH_CRITERIA__EXCLUDE_CREATED_DATE in data[self.YAML__SEARCH_CRITERIA]:
-            exclude_created_date = data[self.YAML__SEARCH_CRITERIA][self.YAML__SEARCH_CRITERIA__EXCLUDE_CREATED_DATE]
-            if exclude_created_date != None and exclude_created_date != "":
-                 jql_restrict_dates += f" AND created >= '{exclude_created_date}'"
+        exclude_created_date = search_criteria.get(self.YAML__SEARCH_CRITERIA__EXCLUDE_CREATED_DATE)
+        if exclude_created_date != None and exclude_created_date != "":
+             jql_date_conditions.append(f"created >= '{exclude_created_date}'")
         # Issues resolved after a certain date
-        if self.YAML__SEARCH_CRITERIA__EXCLUDE_RESOLVED_DATE in data[self.YAML__SEARCH_CRITERIA]:
-            exclude_resolved_date = data[self.YAML__SEARCH_CRITERIA][self.YAML__SEARCH_CRITERIA__EXCLUDE_RESOLVED_DATE]
-            if exclude_resolved_date != None and exclude_resolved_date != "":
-                 jql_restrict_dates += f" AND (resolved IS EMPTY OR resolved >= '{exclude_resolved_date}')"
+        exclude_resolved_date = search_criteria.get(self.YAML__SEARCH_CRITERIA__EXCLUDE_RESOLVED_DATE)
+        if exclude_resolved_date != None and exclude_resolved_date != "":
+             jql_date_conditions.append(f"(resolved IS EMPTY OR resolved >= '{exclude_resolved_date}')")
+
+        # Set up the defined issue types
+        issue_types = search_criteria.get(self.YAML__SEARCH_CRITERIA__ISSUE_TYPES, _MISSING)
+        if issue_types is not _MISSING:
+            self._issue_types.extend(issue_types)
 
         # Set up the JQL query to retrieve the right issues
-        if self.YAML__SEARCH_CRITERIA__FILTER in data[self.YAML__SEARCH_CRITERIA]:
+        # Empty keys (parsed as None) are treated as if they were not defined at all
+        jql_filter = search_criteria.get(self.YAML__SEARCH_CRITERIA__FILTER)
+        project_keys = search_criteria.get(self.YAML__SEARCH_CRITERIA__PROJECTS)
+        if jql_filter != None and jql_filter != "":
             # Creates a query where it selects the given filter
-            jql_query = "filter = '" + data[self.YAML__SEARCH_CRITERIA][self.YAML__SEARCH_CRITERIA__FILTER] + "'" 
-        elif self.YAML__SEARCH_CRITERIA__PROJECTS in data[self.YAML__SEARCH_CRITERIA] and len(data[self.YAML__SEARCH_CRITERIA][self.YAML__SEARCH_CRITERIA__PROJECTS]) > 0:
-            # Creates a default JQL query like "project IN(PKEY1, PKEY2) ORDER BY issuekey ASC
-            jql_query = "project IN("
-            for project_key in data[self.YAML__SEARCH_CRITERIA][self.YAML__SEARCH_CRITERIA__PROJECTS]:
-                jql_query += project_key + ", "
-            jql_query = jql_query[:-2] + ")"
-
-            jql_query += self._issue_type_jql_string(data)
-            jql_query += jql_restrict_dates
-            jql_query += " ORDER BY issuekey ASC"       
+            self._jql_query = f"filter = '{jql_filter}'"
+        elif project_keys != None and len(project_keys) > 0:
+            # Creates a default JQL query like "project IN(PKEY1, PKEY2) AND ... ORDER BY issuekey ASC"
+            jql_conditions = [self._jql_list_of_values("project", project_keys)]
+            if len(self._issue_types) > 0:
+                jql_conditions.append(self._jql_list_of_values("issuetype", self._issue_types))
+            jql_conditions.extend(jql_date_conditions)
+            self._jql_query = " AND ".join(jql_conditions) + self.JQL_ORDER_BY
         else:
             raise ValueError("Couldn't build JQL query. No project key or filter defined in YAML configuration file.")
-        
-        self._jql_query = jql_query
-
-        # Set up the defined issue types
-        if self.YAML__SEARCH_CRITERIA__ISSUE_TYPES in data[self.YAML__SEARCH_CRITERIA]:
-            for issue_type in data[self.YAML__SEARCH_CRITERIA][self.YAML__SEARCH_CRITERIA__ISSUE_TYPES]:
-                self._issue_types.append(issue_type)
 
         # Define the maximum search results
-        if self.YAML__SEARCH_CRITERIA__MAX_RESULTS in data[self.YAML__SEARCH_CRITERIA]:
-            self._max_results = data[self.YAML__SEARCH_CRITERIA][self.YAML__SEARCH_CRITERIA__MAX_RESULTS]
+        max_results = search_criteria.get(self.YAML__SEARCH_CRITERIA__MAX_RESULTS, _MISSING)
+        if max_results is not _MISSING:
+            self._max_results = max_results
 
         # Set et the additional field default field names
         if self.YAML__DEFAULT_FIELDS in data:
-            for key, value in data[self.YAML__DEFAULT_FIELDS].items():
-                if isinstance(value, bool) and value == True:
+            default_fields = data[self.YAML__DEFAULT_FIELDS]
+            for key, value in default_fields.items():
+                if value is True:
                     self._default_fields.append(key)
-                    match key:
-                        case "Flagged":
-                            if self.YAML__MANDATORY_FLAGGED not in data[self.YAML__MANDATORY] or data[self.YAML__MANDATORY][self.YAML__MANDATORY_FLAGGED] == "":
-                                raise ValueError("Flagged field ID not defined in YAML file.")
-                            self._field_id_flagged = data[self.YAML__MANDATORY][self.YAML__MANDATORY_FLAGGED]
-                            self._default_fields_internal_names[key] = self._field_id_flagged
-                            self._fields_to_fetch.append(self._field_id_flagged)
-                        case _:
-                            if key in self._default_fields_internal_names.keys() and key not in self._fields_to_fetch:
-                                self._fields_to_fetch.append(self._default_fields_internal_names[key])
-                            else:
-                                raise ValueError(f"Unknown default field: {key}")
+                    if key == "Flagged":
+                        field_id_flagged = mandatory.get(self.YAML__MANDATORY_FLAGGED, "")
+                        if field_id_flagged == "":
+                            raise ValueError("Flagged field ID not defined in YAML file.")
+                        self._field_id_flagged = field_id_flagged
+                        self._default_fields_internal_names[key] = field_id_flagged
+                        self._add_field_to_fetch(field_id_flagged)
+                    elif key in self._default_fields_internal_names:
+                        self._add_field_to_fetch(self._default_fields_internal_names[key])
+                    else:
+                        raise ValueError(f"Unknown default field: {key}")
 
         # Set up all defined custom fields
         if self.YAML__CUSTOM_FIELDS in data:
             self._custom_fields = data[self.YAML__CUSTOM_FIELDS]
             for custom_field_id in self._custom_fields.values():
-                self._fields_to_fetch.append(custom_field_id)
-
-        if self.YAML__MISC in data:
-            if self.YAML__MISC__CUSTOM_FIELD_PREFIX in data[self.YAML__MISC]:
-                self._custom_field_prefix = data[self.YAML__MISC][self.YAML__MISC__CUSTOM_FIELD_PREFIX]
-            
-            if self.YAML__MISC__STATUS_CATEGORY_PREFIX in data[self.YAML__MISC]:
-                self._status_category_prefix = data[self.YAML__MISC][self.YAML__MISC__STATUS_CATEGORY_PREFIX]
-
-            if self.YAML__MISC__DECIMAL_SEPARATOR in data[self.YAML__MISC]:
-                match data[self.YAML__MISC][self.YAML__MISC__DECIMAL_SEPARATOR]:
-                    case self.DECIMAL_SEPARATOR_POINT:
-                        self._decimal_separator = self.DECIMAL_SEPARATOR_POINT
-                    case _:
-                        self._decimal_separator = self.DECIMAL_SEPARATOR_COMMA
-            
-            if self.YAML__MISC__TIME_ZONE in data[self.YAML__MISC]:
-                self._time_zone = data[self.YAML__MISC][self.YAML__MISC__TIME_ZONE]
+                self._add_field_to_fetch(custom_field_id)
+
+        misc = data.get(self.YAML__MISC) or {}
+        custom_field_prefix = misc.get(self.YAML__MISC__CUSTOM_FIELD_PREFIX, _MISSING)
+        if custom_field_prefix is not _MISSING:
+            self._custom_field_prefix = custom_field_prefix
+        
+        status_category_prefix = misc.get(self.YAML__MISC__STATUS_CATEGORY_PREFIX, _MISSING)
+        if status_category_prefix is not _MISSING:
+            self._status_category_prefix = status_category_prefix
+
+        decimal_separator = misc.get(self.YAML__MISC__DECIMAL_SEPARATOR, _MISSING)
+        if decimal_separator is not _MISSING:
+            if decimal_separator in self.DECIMAL_SEPARATORS:
+                self._decimal_separator = decimal_separator
+            else:
+                self._decimal_separator = self.DECIMAL_SEPARATOR_COMMA
+        
+        time_zone = misc.get(self.YAML__MISC__TIME_ZONE, _MISSING)
+        if time_zone is not _MISSING:
+            self._time_zone = time_zone
 
         # Set up all workflow-related information.
         # This must be done at the very end since it requires
         # the misc variable 'category prefix'.
         if self.YAML__WORKFLOW in data:
-            self._status_categories = []
-            for status_category in data[self.YAML__WORKFLOW]:
-                prefixed_status_category = self.get_status_category_prefix() + status_category
-                self._status_categories.append(prefixed_status_category)
-                for status in data[self.YAML__WORKFLOW][status_category]:
-                    self._status_category_mapping[status] = prefixed_status_category
+            workflow = data[self.YAML__WORKFLOW]
+            status_category_prefix = self._status_category_prefix
+            # Interned since the categories and statuses are looked up for every status transition of every issue
+            self._status_categories = [sys.intern(status_category_prefix + status_category) for status_category in workflow]
+            self._status_category_mapping = {
+                sys.intern(str(status)): prefixed_status_category
+                for prefixed_status_category, statuses in zip(self._status_categories, workflow.values())
+                for status in statuses
+            }
+            self._has_workflow = len(self._status_categories) > 0
+            if self._has_workflow:
+                for field_id in self.WORKFLOW_FIELDS_TO_FETCH:
+                    self._add_field_to_fetch(field_id)
 
         return None
 
 
-    def _issue_type_jql_string(self, data:dict) -> str:
-        """...
+    def _add_field_to_fetch(self, field_id:str):
+        """Adds a field ID to the fields fetched from Jira, unless it is already there.
 
         Args:
-            ...: ...
+            field_id: The Jira ID of the field, e.g. 'summary' or 'customfield_10021'.
 
         Returns:
-            ...
+            None.
+        """
+        if field_id not in self._fields_to_fetch_seen:
+            self._fields_to_fetch.append(field_id)
+            self._fields_to_fetch_seen.add(field_id)
+        return None
 
-        Raises:
-            ...: ...
+
+    def _jql_list_of_values(self, issue_field:str, values:list) -> str:
+        """Builds a JQL condition that matches an issue field against a list of values.
+
+        Args:
+            issue_field: The name of the issue field as used in JQL, e.g. 'project'.
+            values: The values to match. Non-string values (e.g. numeric project
+                keys parsed by YAML) are converted to strings.
+
+        Returns:
+            A JQL condition like "project IN(PKEY1, PKEY2)".
         """
-        jql_query = ""
-        if self.YAML__SEARCH_CRITERIA in data \
-            and self.YAML__SEARCH_CRITERIA__ISSUE_TYPES in data[self.YAML__SEARCH_CRITERIA] \
-            and len(data[self.YAML__SEARCH_CRITERIA][self.YAML__SEARCH_CRITERIA__ISSUE_TYPES]) > 0:
-            
-            jql_query += " AND issuetype IN("
-            for issue_type in data[self.YAML__SEARCH_CRITERIA][self.YAML__SEARCH_CRITERIA__ISSUE_TYPES]:
-                jql_query += issue_type + ", "
-            jql_query = jql_query[:-2] + ")"
-        
-        return jql_query
\ No newline at end of file
+        return f"{issue_field} IN({', '.join(map(str, values))})"
\ No newline at end of file
@@ -1,16 +1,50 @@
 # coding: utf8
 
 from jira import JIRA
-import math
-import chardet
 from .exporter_config import ExporterConfig
 
 class IssueParser:
+    # No per-instance __dict__, the attributes are fixed
+    __slots__ = (
+        "_config",
+        "_jira",
+        "_issues",
+        "_parsed_data",
+        "_status_category_columns",
+        "_empty_status_categories",
+        "_last_percentage",
+        "_default_field_parsers"
+    )
+
+    # Character replacement (old, new) applied to float values for each decimal separator
+    DECIMAL_SEPARATOR_REPLACEMENTS = {
+        ExporterConfig.DECIMAL_SEPARATOR_POINT: (",", "."),
+        ExporterConfig.DECIMAL_SEPARATOR_COMMA: (".", ",")
+    }
+
     def __init__(self, config:object):
         self._config = config
         self._jira = JIRA(config.get_domain(), basic_auth=(config.get_username(), config.get_api_token()))
         self._issues = []
         self._parsed_data = []
+        # The status categories are the same for every issue, so parse their column names only once
+        self._status_category_columns = {status_category: self._parse_field_value(status_category) for status_category in config.get_status_categories()}
+        self._empty_status_categories = dict.fromkeys(self._status_category_columns.values())
+        self._last_percentage = -1 # percentage last shown by the progress bar
+        # Each parser writes the column(s) of its default field into the issue data.
+        # The fields issueID, issueKey and issueType are always exported and need none.
+        self._default_field_parsers = {
+            "Reporter": self._parse_default_field_reporter,
+            "Assignee": self._parse_default_field_assignee,
+            "Summary": self._parse_default_field_summary,
+            "Status": self._parse_default_field_status,
+            "Resolution": self._parse_default_field_resolution,
+            "Priority": self._parse_default_field_priority,
+            "Created": self._parse_default_field_created,
+            "Resolved": self._parse_default_field_resolved,
+            "Flagged": self._parse_default_field_flagged,
+            "Labels": self._parse_default_field_labels
+        }
 
 
     def fetch_issues(self, jql_query:str="", max_results:int=0):
@@ -31,7 +65,13 @@ class IssueParser:
         if max_results == 0:
             max_results = self._config.get_max_results()
 
-        self._issues = self._jira.search_issues(jql_query, fields=self._config.get_fields_to_fetch(), maxResults=max_results)
+        # The changelog is fetched along with the issues to avoid one extra request per issue.
+        # It is only needed for the workflow timestamps, and it is by far the largest part of an issue.
+        expand = None
+        if self._config.has_workflow():
+            expand = "changelog"
+
+        self._issues = self._jira.search_issues(jql_query, fields=self._config.get_fields_to_fetch(), expand=expand, maxResults=max_results)
 
     def parse_issues(self) -> list:
         """...
@@ -48,72 +88,120 @@ class IssueParser:
 
         number_of_issues = len(self._issues)
         i = 1
+        # The number of rows is known upfront, one per fetched issue
+        self._parsed_data = [None] * number_of_issues
+        # The config does not change while parsing, so look everything up only once
+        custom_field_prefix = self._config.get_custom_field_prefix()
+        # Pairs of (column name, field ID), the column names are the same for every issue
+        custom_fields = [
+            (self._parse_field_value(custom_field_prefix + field_name), field_id)
+            for field_name, field_id in self._config.get_custom_fields().items()
+        ]
+        has_workflow = self._config.has_workflow()
+        # Parsers of the default fields to export, fields without a parser are always exported anyway
+        default_field_parsers = [
+            self._default_field_parsers[field_name]
+            for field_name in self._config.get_default_fields()
+            if field_name in self._default_field_parsers
+        ]
+
         # Crawl all fetches issues
         for issue in self._issues:
-            # Save some variables for later use
-            issue_id = self._parse_field_value(issue.id)
-            issue_status = self._parse_field_value(issue.fields.status.name)
-            issue_creation_date = self._parse_field_value(self._transform_date(issue.fields.created))
-            issue_summary = self._parse_field_value(issue.fields.summary)
             # Get the default values of an issue that are available for each export
-
-            self._display_progress_bar(number_of_issues, i, issue_id, issue.key, issue_summary)
-
+            issue_id = self._parse_field_value(issue.id)
             issue_data = {
                 "issueKey": self._parse_field_value(issue.key),
                 "issueID": issue_id,
                 "issueType": self._parse_field_value(issue.fields.issuetype.name),
             }
             
-            for field_name in self._config.get_default_fields():
-                match field_name:
-                    case "Reporter":
-                        issue_reporter_account_id = ""
-                        if issue.fields.reporter != None:
-                            issue_reporter_account_id = issue.fields.reporter.accountId
-                        issue_data[field_name] = self._parse_field_value(issue.fields.reporter)
-                        issue_data[field_name + " ID"] = self._parse_field_value(issue_reporter_account_id)
-                    case "Assignee":
-                        issue_assignee_account_id = ""
-                        if issue.fields.assignee != None:
-                            issue_assignee_account_id = issue.fields.assignee.accountId
-                        issue_data[field_name] = self._parse_field_value(issue.fields.assignee)
-                        issue_data[field_name + " ID"] = self._parse_field_value(issue_assignee_account_id)
-                    case "Summary":
-                        issue_data[field_name] = issue_summary
-                    case "Status":
-                        issue_data[field_name] = issue_status
-                    case "Resolution":
-                        issue_data[field_name] = self._parse_field_value(issue.fields.resolution)
-                    case "Priority":
-                        issue_data[field_name] = self._parse_field_value(issue.fields.priority)
-                    case "Created":
-                        issue_data[field_name] = issue_creation_date
-                    case "Resolved":
-                        issue_data[field_name] = self._parse_resolution_date(issue.fields.resolutiondate)
-                    case "Flagged":
-                        issue_data[field_name] = self._parse_flagged(eval("issue.fields." + self._config.get_field_id_flagged()))
-                    case "Labels":
-                        issue_data[field_name] = self._parse_labels(issue.fields.labels)
+            for parse_default_field in default_field_parsers:
+                parse_default_field(issue, issue_data)
+
+            # Reuse the summary if it is exported anyway, so it is parsed only once
+            if "Summary" in issue_data:
+                issue_summary = issue_data["Summary"]
+            else:
+                issue_summary = self._parse_field_value(issue.fields.summary)
+
+            self._display_progress_bar(number_of_issues, i, issue_id, issue.key, issue_summary)
+
+            if has_workflow:
+                # Reuse status and creation date if they are exported anyway, so they are parsed only once.
+                # This must be done before the custom fields are added, since they may use the same column names.
+                if "Status" in issue_data:
+                    issue_status = issue_data["Status"]
+                else:
+                    issue_status = self._parse_field_value(issue.fields.status.name)
+                if "Created" in issue_data:
+                    issue_creation_date = issue_data["Created"]
+                else:
+                    issue_creation_date = self._transform_date(issue.fields.created)
 
             # Get the values of the extra custom fields defined in the YAML file
-            if self._config.has_custom_fields():
-                for field_name in self._config.get_custom_fields().keys():
-                    issue_data[self._parse_field_value(self._config.get_custom_field_prefix() + field_name)] = self._parse_field_value(eval("issue.fields." + self._config.get_custom_field_id(field_name)))
+            for column_name, field_id in custom_fields:
+                issue_data[column_name] = self._parse_field_value(getattr(issue.fields, field_id, None))
 
-            if self._config.has_workflow():
-                issue_data.update(self._parse_status_category_timestamps(issue_id, issue_status, issue_creation_date))
+            if has_workflow:
+                issue_data.update(self._parse_status_category_timestamps(issue, issue_status, issue_creation_date))
             
+            self._parsed_data[i - 1] = issue_data
             i += 1
-            self._parsed_data.append(issue_data)
 
         return self._parsed_data
 
 
+    def _parse_default_field_reporter(self, issue, issue_data:dict):
+        issue_reporter_account_id = ""
+        if issue.fields.reporter != None:
+            issue_reporter_account_id = issue.fields.reporter.accountId
+        issue_data["Reporter"] = self._parse_field_value(issue.fields.reporter)
+        issue_data["Reporter ID"] = self._parse_field_value(issue_reporter_account_id)
+
+
+    def _parse_default_field_assignee(self, issue, issue_data:dict):
+        issue_assignee_account_id = ""
+        if issue.fields.assignee != None:
+            issue_assignee_account_id = issue.fields.assignee.accountId
+        issue_data["Assignee"] = self._parse_field_value(issue.fields.assignee)
+        issue_data["Assignee ID"] = self._parse_field_value(issue_assignee_account_id)
+
+
+    def _parse_default_field_summary(self, issue, issue_data:dict):
+        issue_data["Summary"] = self._parse_field_value(issue.fields.summary)
+
+
+    def _parse_default_field_status(self, issue, issue_data:dict):
+        issue_data["Status"] = self._parse_field_value(issue.fields.status.name)
+
+
+    def _parse_default_field_resolution(self, issue, issue_data:dict):
+        issue_data["Resolution"] = self._parse_field_value(issue.fields.resolution)
+
+
+    def _parse_default_field_priority(self, issue, issue_data:dict):
+        issue_data["Priority"] = self._parse_field_value(issue.fields.priority)
+
+
+    def _parse_default_field_created(self, issue, issue_data:dict):
+        issue_data["Created"] = self._transform_date(issue.fields.created)
+
+
+    def _parse_default_field_resolved(self, issue, issue_data:dict):
+        issue_data["Resolved"] = self._parse_resolution_date(issue.fields.resolutiondate)
+
+
+    def _parse_default_field_flagged(self, issue, issue_data:dict):
+        issue_data["Flagged"] = self._parse_flagged(getattr(issue.fields, self._config.get_field_id_flagged(), None))
+
+
+    def _parse_default_field_labels(self, issue, issue_data:dict):
+        issue_data["Labels"] = self._parse_labels(issue.fields.labels)
+
+
     def _parse_field_value(self, value) -> str:
         """...
-        In the end, there is a recursive call to ensure that all strings
-        are transformed to latin-1, since this is the only character set
+        In the end, all strings are transformed to latin-1, since this is the only character set
         that works when exporting the data to CSV.
 
         Args:
@@ -125,38 +213,35 @@ class IssueParser:
         Raises:
             ...: ...
         """
-        if value == None or value == "":
+        if value is None:
             return ""
-        
-        return_string = ""
 
         if isinstance(value, str):
-            # Make sure that special chars are working (TODO: not working atm)
-            # Check if encoding was detected
-            character_set = chardet.detect(value.encode())
-            if character_set["encoding"]:
-                encoded_string = value.encode(character_set["encoding"], errors="strict")
-                return_string = encoded_string.decode("latin-1")
-            else:
-                raise Exception("Encoding detection for string failed.")
+            # ASCII is valid latin-1 as it is, this covers most values including empty strings
+            if value.isascii():
+                return value
 
         elif isinstance(value, float):
-            match self._config.get_decimal_separator():
-                case ExporterConfig.DECIMAL_SEPARATOR_COMMA:
-                    return_string = str(value).replace(".", ",")
-                case _: # ExporterConfig.DECIMAL_SEPARATOR_POINT
-                    return_string = str(value).replace(",", ".")
-            # Ensure the right encoding
-            return_string = self._parse_field_value(return_string)
-        
+            # The config only ever holds one of the two known separators
+            old, new = self.DECIMAL_SEPARATOR_REPLACEMENTS[self._config.get_decimal_separator()]
+            # Only digits, sign and separator, so there is nothing to encode
+            return str(value).replace(old, new)
+
+        elif isinstance(value, int): # also covers bool
+            # Only digits and sign, so there is nothing to encode
+            return str(value)
+
         else:
-            # Ensure the right encoding
-            return_string = self._parse_field_value(str(value))
-        
-        return return_string
+            # Objects like users or priorities are exported by their names, which may contain special chars
+            value = str(value)
 
+        # Make sure that special chars are working (TODO: not working atm)
+        # Strings from Jira are always Unicode, so take their UTF-8 bytes as they are.
+        # Every byte is valid latin-1, hence this cannot fail.
+        return value.encode("utf-8", errors="replace").decode("latin-1")
 
-    def _parse_status_category_timestamps(self, issue_id, issue_status, issue_creation_date) -> dict:
+
+    def _parse_status_category_timestamps(self, issue, issue_status, issue_creation_date) -> dict:
         """...
 
         Args:
@@ -168,17 +253,16 @@ class IssueParser:
         Raises:
             ...: ...
         """
-        categories = {}
         # Initiate the status category timestamps by adding all of them with value None
-        for status_category in self._config.get_status_categories():
-            categories[self._parse_field_value(status_category)] = None
+        categories = dict(self._empty_status_categories)
+        status_category_columns = self._status_category_columns
         
         # Set the issue's creation date as a guess for the initial status
-        initial_category = self._parse_field_value(self._config.get_status_category_from_status(issue_status))
+        initial_category = status_category_columns[self._config.get_status_category_from_status(issue_status)]
         categories[initial_category] = issue_creation_date        
 
         # Crawl through all changelogs of an issue
-        changelogs = self._jira.issue(issue_id, expand="changelog").changelog.histories
+        changelogs = issue.changelog.histories
         for changelog in changelogs:
             # Crawl through all items of the changelog
             items = changelog.items
@@ -186,31 +270,31 @@ class IssueParser:
                 # Transitions are saved in the field status
                 if item.field == "status":
                     # Get the date and strip all unnecessary timezone information
-                    date = self._parse_field_value(self._transform_date(changelog.created))
+                    date = self._transform_date(changelog.created)
                     # Get the old and new status from Jira
                     origin_status = self._parse_field_value(item.fromString)
                     destination_status = self._parse_field_value(item.toString)
                     # Get the old and new status categories based on the given status
                     origin_category = self._config.get_status_category_from_status(origin_status)
                     destination_category = self._config.get_status_category_from_status(destination_status)
-                    # Get the transition dates based on the categories
-                    origin_transition_date = categories[origin_category]
-                    destination_transition_date = categories[destination_category]
+                    # Get the transition date of the new category by its column name
+                    destination_column = status_category_columns[destination_category]
+                    destination_transition_date = categories[destination_column]
                     
                     # Only set a new timestamp when the category has changed
                     if origin_category is not None and origin_category != destination_category:
                         # Only set the timestamp for valid timestamps
-                        if destination_status in self._config.get_status_category_mapping().keys():
+                        if destination_status in self._config.get_status_category_mapping():
                             if destination_transition_date is None or destination_transition_date < date:
-                                categories[self._parse_field_value(destination_category)] = issue_creation_date # always set the creation date to the from status to get the info for the very first status
-                                categories[self._parse_field_value(destination_category)] = date
+                                categories[destination_column] = date
                         else:
                             raise ValueError(f"Invalid status: '{destination_status}'; Date: '{date}'")
                         
         return categories
 
 
-    def _transform_date(self, timestamp:str):
+    @staticmethod
+    def _transform_date(timestamp:str):
         """TODO: Must be implemented.
 
         Args:
@@ -227,13 +311,14 @@ class IssueParser:
         #    ...
         #else:
         #    raise ValueError("Invalid timezone string!")
+        # Jira timestamps are ISO 8601 and ASCII only, so the date needs no further encoding
         return timestamp[0:10]
     
 
     def _parse_labels(self, labels:list):
         return_string = ""
-        if len(labels) > 0:
-           return_string = "'" + "'|'".join([x for x in labels]) + "'"
+        if labels:
+            return_string = "'" + "'|'".join(labels) + "'"
         return self._parse_field_value(return_string)
 
 
@@ -241,7 +326,7 @@ class IssueParser:
         return_string = ""
         if date != None and len(str(date)) > 0:
             return_string = date
-        return self._parse_field_value(self._transform_date(return_string))
+        return self._transform_date(return_string)
 
         
     def _parse_flagged(self, value):
@@ -249,11 +334,17 @@ class IssueParser:
 
 
     def _display_progress_bar(self, number_of_issues:int, iterator:int, issue_id:str, issue_key:str, issue_summary:str):
-        percentage = math.ceil(iterator/number_of_issues*100)
+        percentage = -(-iterator * 100 // number_of_issues) # rounded up, in integer math
+        is_last_issue = iterator == number_of_issues
+
+        # Only redraw when the percentage has changed, but always show the last issue
+        if percentage == self._last_percentage and not is_last_issue:
+            return
+        self._last_percentage = percentage
 
         progress_bar_length = 10
         
-        length_done = int(percentage / 10)
+        length_done = percentage // 10
         length_todo = progress_bar_length - length_done
 
         progress_bar_done = "#" * length_done
@@ -262,9 +353,9 @@ class IssueParser:
         progress_bar = "[" + progress_bar_done + progress_bar_todo + "]"
         
         end_of_print = "\r"
-        if percentage == 100:
+        if is_last_issue: # the percentage is rounded up and may reach 100 before the last issue
             end_of_print = "\n"
         
-        print(f" {progress_bar} {iterator}/{number_of_issues} ({percentage}%) {issue_key} ({issue_id}): {issue_summary}", end=end_of_print)
-        if percentage < 100:
-            print("\033[2K", end="") # Clear entire line
\ No newline at end of file
+        # Clear the entire line before drawing, so the bar stays visible until the next redraw
+        print("\033[2K", end="")
+        print(f" {progress_bar} {iterator}/{number_of_issues} ({percentage}%) {issue_key} ({issue_id}): {issue_summary}", end=end_of_print)
\ No newline at end of file